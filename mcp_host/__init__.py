@@ -0,0 +1 @@
+"""MCP Host - orchestrates Claude and the MCP servers for the voice shopping agent."""
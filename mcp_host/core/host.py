@@ -9,20 +9,32 @@ This module provides the main MCPHost class that:
 """
 
 import asyncio
+import fnmatch
 import json
 import os
 import sys
-from contextlib import AsyncExitStack
+import time
+from collections import Counter, OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 from .state_manager import SessionState
 from .prompt_builder import PromptBuilder
+from .tool_cache import ToolResultStore
+
+
+class ToolCallError(Exception):
+    """A tool call failed while the host runs with stop_on_error."""
+
+    def __init__(self, tool_name: str, result: str):
+        super().__init__(f"{tool_name} failed: {result}")
+        self.tool_name = tool_name
+        self.result = result
 
 
 class MCPHost:
@@ -35,14 +47,63 @@ class MCPHost:
     - Session state (basket, user context)
     """
 
-    def __init__(self, config_dir: Path | None = None):
+    # Seconds a tool result stays fresh, matched against the prefixed tool name.
+    # Tools that do not match are never cached (e.g. SFCC actions with side effects).
+    TOOL_CACHE_TTLS: dict[str, float] = {
+        "weather__*": 300,
+    }
+    TOOL_CACHE_MAXSIZE = 256
+
+    # Circuit breaker limits for the tool-use loop within one user turn
+    MAX_TOOL_ITERS = 8
+    MAX_IDENTICAL_RETRIES = 2
+    MAX_TURN_INPUT_TOKENS = 150_000
+
+    # Longer tool results are cut before they enter the conversation history
+    TOOL_RESULT_MAX_CHARS = 8000
+
+    # Once history exceeds the window, everything but the newest half of it is
+    # folded into a summary, so summarizing happens every few turns, not every turn
+    HISTORY_WINDOW = 20
+    SUMMARY_PROMPT = (
+        "Summarize the following into <=300 tokens preserving entities, "
+        "basket state, and pending actions."
+    )
+
+    def __init__(
+        self,
+        config_dir: Path | None = None,
+        stop_on_error: bool = False,
+        persistent_cache: bool = True
+    ):
         load_dotenv()
 
-        self.anthropic = Anthropic()
+        # Cancel the other tool calls of a response as soon as one fails
+        self.stop_on_error = stop_on_error
+
+        self.anthropic = AsyncAnthropic()
+        # Environment passed to every server subprocess, copied once after .env is loaded
+        self._env_snapshot = dict(os.environ)
         self.sessions: dict[str, ClientSession] = {}
-        self.tools: list[dict] = []
+        # Sorted by name and frozen so the tools payload is byte-stable for prompt caching
+        self.tools: tuple[dict, ...] = ()
+        self._api_tools: list[dict] = []
         self.tool_to_server: dict[str, str] = {}
-        self.exit_stack = AsyncExitStack()
+        # Prefixed tool name -> (server name, server-side tool name)
+        self._tool_index: dict[str, tuple[str, str]] = {}
+
+        # Launch parameters for every registered server, connected or not
+        self._server_params: dict[str, StdioServerParameters] = {}
+        self._connect_locks: dict[str, asyncio.Lock] = {}
+
+        # Each server connection lives in its own task until shutdown is set
+        self._connection_tasks: list[asyncio.Task] = []
+        self._shutdown = asyncio.Event()
+
+        # Tool result cache: key -> (timestamp, result)
+        self._tool_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Backing store that keeps cacheable results across runs
+        self._disk_cache = ToolResultStore.open_default() if persistent_cache else None
 
         # Session state
         self.state = SessionState()
@@ -61,164 +122,601 @@ class MCPHost:
         command: str,
         args: list[str],
         cwd: str | None = None
-    ) -> None:
-        """Connect to an MCP server via stdio."""
+    ) -> list[dict]:
+        """
+        Connect to an MCP server via stdio and register its tools.
+
+        Returns:
+            The server's tool schemas, without the server prefix
+        """
         print(f"Connecting to MCP server: {name}...")
 
-        server_params = StdioServerParameters(
+        self._server_params[name] = StdioServerParameters(
             command=command,
             args=args,
             cwd=cwd,
-            env={**os.environ},
-        )
-
-        read, write = await self.exit_stack.enter_async_context(
-            stdio_client(server_params)
-        )
-        session = await self.exit_stack.enter_async_context(
-            ClientSession(read, write)
+            env=self._env_snapshot,
         )
-
-        await session.initialize()
-        self.sessions[name] = session
+        session = await self._open_session(name)
 
         # Discover tools from this server
         tools_response = await session.list_tools()
-        for tool in tools_response.tools:
-            tool_def = {
-                "name": f"{name}__{tool.name}",
+        schemas = [
+            {
+                "name": tool.name,
                 "description": tool.description or f"Tool: {tool.name}",
                 "input_schema": tool.inputSchema,
             }
-            self.tools.append(tool_def)
-            self.tool_to_server[f"{name}__{tool.name}"] = name
+            for tool in tools_response.tools
+        ]
+        self._register_tools(name, schemas)
+
+        print(f"  Connected to {name}! Found {len(schemas)} tools:")
+        for schema in schemas:
+            print(f"    - {schema['name']}")
+        return schemas
+
+    async def _open_session(self, name: str) -> ClientSession:
+        """Start the connection task for a registered server and wait until it is ready."""
+        ready: asyncio.Future[ClientSession] = asyncio.get_running_loop().create_future()
+        self._connection_tasks.append(
+            asyncio.create_task(self._run_connection(name, self._server_params[name], ready))
+        )
+        session = await ready
+        self.sessions[name] = session
+        return session
+
+    async def _ensure_connected(self, name: str) -> ClientSession:
+        """Connect a lazily registered server on first use."""
+        async with self._connect_locks.setdefault(name, asyncio.Lock()):
+            session = self.sessions.get(name)
+            if session is None:
+                print(f"Connecting to MCP server: {name}...")
+                session = await self._open_session(name)
+            return session
+
+    def _register_tools(self, name: str, schemas: list[dict]) -> None:
+        """Expose a server's tools to Claude under the server-name prefix."""
+        tool_defs = []
+        for schema in schemas:
+            tool_def = {**schema, "name": f"{name}__{schema['name']}"}
+            tool_defs.append(tool_def)
+            self.tool_to_server[tool_def["name"]] = name
+            self._tool_index[tool_def["name"]] = (name, schema["name"])
+        self._set_tools([*self.tools, *tool_defs])
+
+    def _set_tools(self, tools: list[dict]) -> None:
+        """Store tools in canonical order and precompute the payload sent to Claude."""
+        self.tools = tuple(sorted(tools, key=lambda t: t["name"]))
+        self._api_tools = list(self.tools)
+        if self._api_tools:
+            # Caching the last tool caches the whole tools array
+            self._api_tools[-1] = {**self._api_tools[-1], "cache_control": {"type": "ephemeral"}}
+
+    async def _run_connection(
+        self,
+        name: str,
+        server_params: StdioServerParameters,
+        ready: asyncio.Future
+    ) -> None:
+        """
+        Own one server's stdio transport and session until cleanup.
 
-        print(f"  Connected! Found {len(tools_response.tools)} tools:")
-        for tool in tools_response.tools:
-            print(f"    - {tool.name}")
+        The transport and session hold anyio task groups that must be exited by
+        the task that entered them, so each server gets its own long-lived task.
+        """
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await self._shutdown.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"  Lost connection to {name}: {e}")
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    async def connect_all_servers(self, project_root: Path, lazy: bool = True) -> None:
+        """
+        Register all enabled MCP servers from config.
+
+        With lazy=True, a server whose tool schemas are cached from a previous run
+        (and whose script is unchanged) is only registered; it connects on its
+        first tool call. The remaining servers are connected concurrently and
+        their schemas are written back to the cache.
+        """
+        cache_path = project_root / "data" / ".tool_cache.json"
+        try:
+            tool_cache = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            tool_cache = {}
 
-    async def connect_all_servers(self, project_root: Path) -> None:
-        """Connect to all enabled MCP servers from config."""
+        to_connect = []
         for name, config in self.server_configs.items():
             if not config.get("enabled", True):
                 continue
 
+            command = sys.executable if config["command"] == "python" else config["command"]
+            args = [str(project_root / arg) for arg in config["args"]]
+            cwd = str(project_root / config["cwd"]) if config.get("cwd") else str(project_root)
+
+            cached = tool_cache.get(name)
+            if lazy and cached and cached["key"] == _server_cache_key(args):
+                self._server_params[name] = StdioServerParameters(
+                    command=command,
+                    args=args,
+                    cwd=cwd,
+                    env=self._env_snapshot,
+                )
+                self._register_tools(name, cached["tools"])
+                print(f"Registered MCP server: {name} ({len(cached['tools'])} tools, connects on first use)")
+            else:
+                to_connect.append((name, command, args, cwd))
+
+        results = await asyncio.gather(*(
+            self._connect_from_config(name, command, args, cwd)
+            for name, command, args, cwd in to_connect
+        ))
+
+        updated = False
+        for (name, _command, args, _cwd), schemas in zip(to_connect, results):
+            key = _server_cache_key(args)
+            if schemas is not None and key is not None:
+                tool_cache[name] = {"key": key, "tools": schemas}
+                updated = True
+        if updated:
             try:
-                command = sys.executable if config["command"] == "python" else config["command"]
-                args = [str(project_root / arg) for arg in config["args"]]
-                cwd = str(project_root / config["cwd"]) if config.get("cwd") else str(project_root)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(json.dumps(tool_cache))
+            except OSError as e:
+                print(f"  Failed to write tool cache: {e}")
 
-                await self.connect_to_server(name, command, args, cwd)
-            except Exception as e:
-                print(f"  Failed to connect to {name}: {e}")
+    async def _connect_from_config(
+        self,
+        name: str,
+        command: str,
+        args: list[str],
+        cwd: str
+    ) -> list[dict] | None:
+        """Connect to one configured server, reporting rather than raising failures."""
+        try:
+            return await self.connect_to_server(name, command, args, cwd)
+        except Exception as e:
+            print(f"  Failed to connect to {name}: {e}")
+            return None
+
+    def _cache_ttl(self, tool_name: str) -> float | None:
+        """Get the cache TTL for a tool, or None if it should not be cached."""
+        for pattern, ttl in self.TOOL_CACHE_TTLS.items():
+            if fnmatch.fnmatchcase(tool_name, pattern):
+                return ttl
+        return None
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
+        """Call a tool on the appropriate MCP server, reusing fresh cached results."""
+        ttl = self._cache_ttl(tool_name)
+        if ttl is None:
+            return await self._call_tool_uncached(tool_name, arguments)
+
+        key = tool_name + "\x1f" + json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+        cached = self._tool_cache.get(key)
+        if cached is not None:
+            timestamp, result = cached
+            if time.monotonic() - timestamp < ttl:
+                self._tool_cache.move_to_end(key)
+                return result
+            del self._tool_cache[key]
+
+        disk_key = ToolResultStore.make_key(key) if self._disk_cache else None
+        if disk_key:
+            stored = self._disk_cache.get(disk_key)
+            if stored is not None:
+                result, remaining = stored
+                self._remember(key, result, time.monotonic() - (ttl - remaining))
+                return result
+
+        result = await self._call_tool_uncached(tool_name, arguments)
+        if not _is_error_result(result):
+            self._remember(key, result, time.monotonic())
+            if disk_key and _is_json_result(result):
+                self._disk_cache.set(disk_key, result, ttl)
+        return result
+
+    def _remember(self, key: str, result: str, timestamp: float) -> None:
+        """Add a result to the in-memory cache, evicting the least recently used."""
+        self._tool_cache[key] = (timestamp, result)
+        if len(self._tool_cache) > self.TOOL_CACHE_MAXSIZE:
+            self._tool_cache.popitem(last=False)
+
+    async def _call_tool_uncached(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """Call a tool on the appropriate MCP server."""
-        server_name = self.tool_to_server.get(tool_name)
-        if not server_name:
+        entry = self._tool_index.get(tool_name)
+        if entry is None:
             return json.dumps({"error": f"Unknown tool: {tool_name}"})
-
-        actual_tool_name = tool_name.split("__", 1)[1]
-        session = self.sessions[server_name]
+        server_name, actual_tool_name = entry
 
         try:
+            session = self.sessions.get(server_name) or await self._ensure_connected(server_name)
             result = await session.call_tool(name=actual_tool_name, arguments=arguments)
-            if hasattr(result, 'content'):
-                contents = []
-                for content in result.content:
-                    if hasattr(content, 'text'):
-                        contents.append(content.text)
-                    else:
-                        contents.append(str(content))
-                return "\n".join(contents)
-            return str(result)
+            contents = getattr(result, "content", None)
+            if contents is None:
+                return str(result)
+            if len(contents) == 1:
+                text = getattr(contents[0], "text", None)
+                return text if text is not None else str(contents[0])
+            parts = []
+            for content in contents:
+                text = getattr(content, "text", None)
+                parts.append(text if text is not None else str(content))
+            return "\n".join(parts)
         except Exception as e:
             return json.dumps({"error": str(e)})
 
-    async def chat(self, user_message: str) -> str:
+    async def _dispatch_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
         """
-        Process a user message using Claude and available MCP tools.
+        Run one tool call as part of a response's TaskGroup.
 
-        Args:
-            user_message: The user's input
+        Failures normally come back as an error payload so sibling calls keep
+        running. With stop_on_error they raise ToolCallError instead, which makes
+        the TaskGroup cancel every other call still in flight.
+        """
+        try:
+            result = await self.call_tool(tool_name, arguments)
+        except Exception as e:
+            result = json.dumps({"error": str(e)})
+        if self.stop_on_error and _is_error_result(result):
+            raise ToolCallError(tool_name, result)
+        return result
 
-        Returns:
-            The assistant's response
+    def _build_tool_results(
+        self,
+        content: list,
+        results: dict[str, str],
+        abort_reason: str | None = None
+    ) -> list[dict]:
         """
-        self.state.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        Build tool_result blocks for every tool_use block in a response.
 
-        # Build dynamic system prompt with session context
-        session_context = {
-            "user_location": self.state.user_location,
-            "basket_item_count": self.state.basket_item_count,
-            "basket_total": self.state.basket_total,
-        }
-        system_prompt = self.prompt_builder.build_system_prompt(
-            session_context=session_context
+        Results follow the order of the tool_use blocks. Blocks that were never
+        dispatched because the circuit breaker tripped get an error result.
+        """
+        tool_results = []
+        for block in content:
+            if block.type != "tool_use":
+                continue
+            if block.id not in results:
+                tool_results.append({
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": f"Aborted: {abort_reason}",
+                    "is_error": True,
+                })
+                continue
+
+            result = results[block.id]
+            if len(result) > self.TOOL_RESULT_MAX_CHARS:
+                result = result[:self.TOOL_RESULT_MAX_CHARS] + "…[truncated]"
+            tool_results.append({
+                "type": "tool_result",
+                "tool_use_id": block.id,
+                "content": result,
+            })
+        return tool_results
+
+    async def _maybe_compact_history(self) -> None:
+        """
+        Fold old turns into a single summary message once history exceeds the window.
+
+        Only the newest HISTORY_WINDOW // 2 messages are kept verbatim, so the
+        next summary is not due until history has grown past the window again.
+
+        The kept suffix always starts at a plain user message so tool_use and
+        tool_result pairs are never split.
+        """
+        history = self.state.conversation_history
+        if len(history) <= self.HISTORY_WINDOW:
+            return
+
+        cut = len(history) - self.HISTORY_WINDOW // 2
+        while cut < len(history) and not (
+            history[cut]["role"] == "user" and isinstance(history[cut]["content"], str)
+        ):
+            cut += 1
+        if cut >= len(history):
+            return
+
+        try:
+            response = await self.anthropic.messages.create(
+                model="claude-sonnet-4-20250514",
+                max_tokens=512,
+                system=self.SUMMARY_PROMPT,
+                messages=[{"role": "user", "content": _render_history(history[:cut])}],
+            )
+        except Exception as e:
+            print(f"  Failed to summarize conversation history: {e}")
+            return
+
+        summary = "".join(
+            block.text for block in response.content if hasattr(block, "text")
         )
+        self.state.conversation_history = [
+            {"role": "user", "content": "[Conversation summary]: " + summary},
+            *history[cut:],
+        ]
+
+    async def _stream_message(
+        self,
+        system_prompt: str,
+        session_context: str,
+        start_tool: Callable[[Any], Awaitable[str] | None],
+        **kwargs: Any
+    ) -> tuple[Any, dict[str, str]]:
+        """
+        Stream a Claude response, starting each tool call as soon as its block completes.
+
+        The system prompt and tool schemas are marked as ephemeral cache blocks
+        so repeated calls within a turn and across turns reuse the cached prefix.
+        Tool calls run in a TaskGroup, so they are cancelled together if the
+        caller is cancelled or, with stop_on_error, if one of them fails.
+
+        Returns:
+            The final message and the tool results keyed by tool_use_id
+        """
+        messages = self.state.conversation_history
+        if session_context:
+            messages = [{"role": "user", "content": session_context}, *messages]
+
+        tasks: dict[str, asyncio.Task] = {}
+        # Identical calls to cacheable (read-only) tools within one response share
+        # a single task; side-effect tools such as add_to_basket run every time
+        started: dict[str, asyncio.Task] = {}
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                async with self.anthropic.messages.stream(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=4096,
+                    system=[{
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"},
+                    }],
+                    tools=self._api_tools,
+                    messages=messages,
+                    **kwargs,
+                ) as stream:
+                    async for event in stream:
+                        if event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                            block = event.content_block
+                            key = _call_key(block.name, block.input)
+                            task = started.get(key)
+                            if task is None:
+                                call = start_tool(block)
+                                if call is None:
+                                    continue
+                                task = task_group.create_task(call)
+                                if self._cache_ttl(block.name) is not None:
+                                    started[key] = task
+                            tasks[block.id] = task
+                    response = await stream.get_final_message()
+        except ExceptionGroup as group:
+            # An API error from the stream itself should not reach chat() wrapped
+            # in a group; only failed tool calls are handled there with except*.
+            if len(group.exceptions) == 1 and not isinstance(group.exceptions[0], ToolCallError):
+                raise group.exceptions[0] from None
+            raise
+
+        return response, {tool_use_id: task.result() for tool_use_id, task in tasks.items()}
+
+    async def _run_tool_loop(self, system_prompt: str, session_context: str) -> Any:
+        """
+        Call Claude and run requested tools until it produces a final answer.
+
+        Guarded by a circuit breaker on iterations, repeated identical failures
+        and input tokens.
+
+        Returns:
+            The final Claude message
+        """
+        failed_calls: Counter[str] = Counter()
+        abort_reason: str | None = None
+
+        async def run_tool(key: str, block: Any) -> str:
+            """Run a tool call, counting it if it returns an error."""
+            result = await self._dispatch_tool(block.name, block.input)
+            if _is_error_result(result):
+                failed_calls[key] += 1
+            return result
+
+        def start_tool(block: Any) -> Awaitable[str] | None:
+            """Dispatch a streamed tool_use block unless the circuit breaker tripped."""
+            nonlocal abort_reason
+            key = _call_key(block.name, block.input)
+            if abort_reason is None and failed_calls[key] > self.MAX_IDENTICAL_RETRIES:
+                abort_reason = "repeated failure"
+            if abort_reason is not None:
+                return None
+
+            print(f"  Calling tool: {block.name}...")
+            return run_tool(key, block)
 
         # Call Claude
-        response = self.anthropic.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4096,
-            system=system_prompt,
-            tools=self.tools,
-            messages=self.state.conversation_history,
-        )
+        response, results = await self._stream_message(system_prompt, session_context, start_tool)
+        input_tokens = _input_tokens(response.usage)
+        iterations = 0
 
         # Process tool calls
         while response.stop_reason == "tool_use":
             assistant_content = response.content
             self.state.conversation_history.append({
                 "role": "assistant",
-                "content": assistant_content
+                "content": _to_plain(assistant_content)
             })
 
-            tool_results = []
-            for block in assistant_content:
-                if block.type == "tool_use":
-                    print(f"  Calling tool: {block.name}...")
-                    result = await self.call_tool(block.name, block.input)
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result,
-                    })
-
             self.state.conversation_history.append({
                 "role": "user",
-                "content": tool_results
+                "content": self._build_tool_results(assistant_content, results, abort_reason)
             })
 
-            response = self.anthropic.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=4096,
-                system=system_prompt,
-                tools=self.tools,
-                messages=self.state.conversation_history,
-            )
+            iterations += 1
+            if abort_reason is None:
+                if iterations >= self.MAX_TOOL_ITERS:
+                    abort_reason = "too many tool calls in one turn"
+                elif input_tokens > self.MAX_TURN_INPUT_TOKENS:
+                    abort_reason = "token budget for this turn exceeded"
+
+            if abort_reason:
+                # Make Claude reply to the user without calling any more tools
+                print(f"  Aborting tool loop: {abort_reason}")
+                response, _ = await self._stream_message(
+                    system_prompt, session_context, start_tool, tool_choice={"type": "none"}
+                )
+                break
+
+            response, results = await self._stream_message(system_prompt, session_context, start_tool)
+            input_tokens += _input_tokens(response.usage)
+
+        return response
+
+    async def chat(self, user_message: str) -> str:
+        """
+        Process a user message using Claude and available MCP tools.
+
+        Args:
+            user_message: The user's input
+
+        Returns:
+            The assistant's response
+        """
+        await self._maybe_compact_history()
+
+        self.state.conversation_history.append({
+            "role": "user",
+            "content": user_message
+        })
+
+        # The system prompt is static so it can be prompt-cached; the per-turn
+        # session context travels as a user message ahead of the history.
+        system_prompt = self.prompt_builder.build_system_prompt()
+        session_context = self.prompt_builder.build_session_context({
+            "user_location": self.state.user_location,
+            "basket_item_count": self.state.basket_item_count,
+            "basket_total": self.state.basket_total,
+        })
+
+        try:
+            response = await self._run_tool_loop(system_prompt, session_context)
+        except* ToolCallError as group:
+            # stop_on_error: the failed call already cancelled its siblings
+            failure = group.exceptions[0]
+            print(f"  Stopping turn: {failure}")
+            response = None
 
         # Extract final response
-        final_response = ""
-        for block in response.content:
-            if hasattr(block, 'text'):
-                final_response += block.text
+        if response is None:
+            final_response = f"Sorry, I couldn't complete that because {failure.tool_name} failed."
+            content = [{"type": "text", "text": final_response}]
+        else:
+            final_response = ""
+            for block in response.content:
+                if hasattr(block, 'text'):
+                    final_response += block.text
+            content = _to_plain(response.content)
 
         self.state.conversation_history.append({
             "role": "assistant",
-            "content": response.content
+            "content": content
         })
 
         return final_response
 
     async def cleanup(self) -> None:
         """Clean up all MCP server connections."""
-        await self.exit_stack.aclose()
+        self._shutdown.set()
+        await asyncio.gather(*self._connection_tasks, return_exceptions=True)
+        if self._disk_cache:
+            self._disk_cache.close()
+            self._disk_cache = None
         print("Disconnected from all servers.")
 
     def reset_session(self) -> None:
         """Reset the session state."""
         self.state.reset()
+
+
+def _server_cache_key(args: list[str]) -> dict | None:
+    """
+    Invalidation key for cached tool schemas: launch args plus the newest source mtime.
+
+    The schemas also depend on modules the script imports, both next to it
+    (e.g. sfcc_api defaults) and one level up (the shared tool_utils helpers).
+    """
+    try:
+        script_dir = Path(args[0]).parent
+        mtime = max(
+            os.path.getmtime(path)
+            for path in [args[0], *script_dir.glob("*.py"), *script_dir.parent.glob("*.py")]
+        )
+    except (IndexError, OSError):
+        return None
+    return {"args": args, "mtime": mtime}
+
+
+def _call_key(name: str, arguments: dict[str, Any]) -> str:
+    """Canonical key identifying a tool call by name and arguments."""
+    return json.dumps([name, arguments], sort_keys=True, separators=(",", ":"))
+
+
+def _input_tokens(usage: Any) -> int:
+    """Total input tokens of a response, including cached prefix reads and writes."""
+    return (
+        usage.input_tokens
+        + (usage.cache_read_input_tokens or 0)
+        + (usage.cache_creation_input_tokens or 0)
+    )
+
+
+def _render_history(messages: list[dict]) -> str:
+    """Render conversation messages as plain text for summarization."""
+    lines = []
+    for message in messages:
+        role = message["role"]
+        content = message["content"]
+        if isinstance(content, str):
+            lines.append(f"{role}: {content}")
+            continue
+
+        for block in content:
+            if block["type"] == "text":
+                lines.append(f"{role}: {block['text']}")
+            elif block["type"] == "tool_use":
+                lines.append(f"{role} called {block['name']}({json.dumps(block['input'])})")
+            elif block["type"] == "tool_result":
+                lines.append(f"tool result: {block['content']}")
+    return "\n".join(lines)
+
+
+def _to_plain(blocks: list) -> list[dict]:
+    """Convert SDK content blocks to plain dicts so history is not re-serialized each turn."""
+    return [block.model_dump(mode="json", exclude_none=True) for block in blocks]
+
+
+def _is_error_result(result: str) -> bool:
+    """Check whether a tool result is a JSON error payload."""
+    try:
+        parsed = json.loads(result)
+    except ValueError:
+        return False
+    return isinstance(parsed, dict) and "error" in parsed
+
+
+def _is_json_result(result: str) -> bool:
+    """Check whether a tool result is valid JSON (only those are persisted)."""
+    try:
+        json.loads(result)
+    except ValueError:
+        return False
+    return True
@@ -1,9 +1,15 @@
 """Dynamic system prompt builder for the shopping agent."""
 
+import functools
 import json
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class PromptBuilder:
     """
@@ -20,8 +26,10 @@ class PromptBuilder:
         if config_path is None:
             config_path = Path(__file__).parent.parent / "config" / "system_prompts.json"
 
-        with open(config_path, "r") as f:
-            self.config = json.load(f)
+        self.config = _load_config(str(config_path))
+
+        # Everything except the session context is fixed at runtime
+        self._static_prefix = self._build_static_prompt()
 
     def build_system_prompt(
         self,
@@ -38,34 +46,64 @@ class PromptBuilder:
         Returns:
             Complete system prompt string
         """
-        parts = []
+        if include_capabilities is None:
+            prompt = self._static_prefix
+        else:
+            prompt = self._build_static_prompt(include_capabilities)
+
+        # Session context
+        if session_context:
+            prompt += "\n\n## Current Session Context:\n" + _session_context_lines(
+                session_context.get("user_location"),
+                session_context.get("basket_item_count", 0),
+                session_context.get("basket_total", 0.0),
+            )
+
+        return prompt
+
+    def build_session_context(self, session_context: dict[str, Any]) -> str:
+        """
+        Build the session context block on its own.
+
+        Kept out of the system prompt so the system prompt stays byte-identical
+        between turns and can be served from Anthropic's prompt cache.
 
-        # Base prompt
-        parts.append(self.config["base_system_prompt"])
+        Args:
+            session_context: Current session context to describe
+
+        Returns:
+            Session context block, or an empty string if there is nothing to report
+        """
+        lines = _session_context_lines(
+            session_context.get("user_location"),
+            session_context.get("basket_item_count", 0),
+            session_context.get("basket_total", 0.0),
+        )
+        if not lines:
+            return ""
+        return f"## Current Session Context:\n{lines}"
+
+    def _build_static_prompt(self, include_capabilities: list[str] | None = None) -> str:
+        """Assemble the session-independent part of the system prompt."""
+        parts = [self.config["base_system_prompt"]]
 
         # Capabilities
         parts.append("\n\n## Your Capabilities:\n")
 
         capabilities = self.config.get("capabilities", {})
-        for key, cap in capabilities.items():
-            if include_capabilities is None or key in include_capabilities:
-                parts.append(f"\n### {cap['name']}\n{cap['system_prompt']}\n")
+        parts.append("".join(
+            f"\n### {cap['name']}\n{cap['system_prompt']}\n"
+            for key, cap in capabilities.items()
+            if include_capabilities is None or key in include_capabilities
+        ))
 
         # Voice considerations
         if "voice_considerations" in self.config:
             parts.append("\n\n## Voice Interaction Guidelines:\n")
-            for key, value in self.config["voice_considerations"].items():
-                formatted_key = key.replace("_", " ").title()
-                parts.append(f"- **{formatted_key}**: {value}\n")
-
-        # Session context
-        if session_context:
-            parts.append("\n\n## Current Session Context:\n")
-            if session_context.get("user_location"):
-                parts.append(f"- User's location: {session_context['user_location']}\n")
-            if session_context.get("basket_item_count", 0) > 0:
-                parts.append(f"- Items in basket: {session_context['basket_item_count']}\n")
-                parts.append(f"- Basket total: £{session_context['basket_total']:.2f}\n")
+            parts.append("".join(
+                f"- **{key.replace('_', ' ').title()}**: {value}\n"
+                for key, value in self.config["voice_considerations"].items()
+            ))
 
         return "".join(parts)
 
@@ -77,3 +115,28 @@ class PromptBuilder:
     def get_all_capabilities(self) -> list[str]:
         """Get list of all capability keys."""
         return list(self.config.get("capabilities", {}).keys())
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config(path: str) -> dict[str, Any]:
+    """Parse a JSON config file once per process; callers must not mutate it."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _session_context_lines(
+    user_location: str | None,
+    basket_item_count: int,
+    basket_total: float
+) -> str:
+    """Format the session context as markdown bullet lines."""
+    parts = []
+    if user_location:
+        parts.append(f"- User's location: {user_location}\n")
+    if basket_item_count > 0:
+        parts.append(f"- Items in basket: {basket_item_count}\n")
+        parts.append(f"- Basket total: £{basket_total:.2f}\n")
+    return "".join(parts)
@@ -5,20 +5,20 @@ from typing import Any
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class BasketItem:
     """An item in the shopping basket."""
     product_id: str
     name: str
     price: float
     quantity: int = 1
+    subtotal: float = field(init=False)
 
-    @property
-    def subtotal(self) -> float:
-        return self.price * self.quantity
+    def __post_init__(self):
+        self.subtotal = self.price * self.quantity
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionState:
     """
     Manages all session state for a shopping conversation.
@@ -30,8 +30,8 @@ class SessionState:
     - Current order information
     """
 
-    # Shopping basket
-    basket: list[BasketItem] = field(default_factory=list)
+    # Shopping basket, keyed by product_id (insertion ordered)
+    basket: dict[str, BasketItem] = field(default_factory=dict)
     discount_code: str | None = None
     discount_amount: float = 0.0
 
@@ -48,10 +48,14 @@ class SessionState:
     # Session metadata
     session_start: datetime = field(default_factory=datetime.now)
 
+    # Running basket totals, kept in step with add/remove/clear
+    _running_total: float = field(default=0.0, init=False, repr=False)
+    _running_count: int = field(default=0, init=False, repr=False)
+
     @property
     def basket_total(self) -> float:
         """Calculate basket total before discount."""
-        return sum(item.subtotal for item in self.basket)
+        return self._running_total
 
     @property
     def basket_total_with_discount(self) -> float:
@@ -61,32 +65,49 @@ class SessionState:
     @property
     def basket_item_count(self) -> int:
         """Total number of items in basket."""
-        return sum(item.quantity for item in self.basket)
+        return self._running_count
 
     def add_to_basket(self, product_id: str, name: str, price: float, quantity: int = 1) -> BasketItem:
         """Add an item to the basket or update quantity if exists."""
-        for item in self.basket:
-            if item.product_id == product_id:
-                item.quantity += quantity
-                return item
+        item = self.basket.get(product_id)
+        if item is not None:
+            item.quantity += quantity
+            item.subtotal = item.price * item.quantity
+            self._running_total += item.price * quantity
+            self._running_count += quantity
+            return item
 
         new_item = BasketItem(product_id=product_id, name=name, price=price, quantity=quantity)
-        self.basket.append(new_item)
+        self.basket[product_id] = new_item
+        self._running_total += new_item.subtotal
+        self._running_count += quantity
         return new_item
 
     def remove_from_basket(self, product_id: str) -> bool:
         """Remove an item from the basket."""
-        for i, item in enumerate(self.basket):
-            if item.product_id == product_id:
-                self.basket.pop(i)
-                return True
-        return False
+        item = self.basket.pop(product_id, None)
+        if item is None:
+            return False
+        self._subtract_item(item)
+        return True
+
+    def _subtract_item(self, item: BasketItem) -> None:
+        """Take a removed item out of the running totals."""
+        if not self.basket:
+            # Reset exactly so float drift cannot accumulate across baskets
+            self._running_total = 0.0
+            self._running_count = 0
+        else:
+            self._running_total -= item.subtotal
+            self._running_count -= item.quantity
 
     def clear_basket(self) -> None:
         """Clear all items from the basket."""
-        self.basket = []
+        self.basket = {}
         self.discount_code = None
         self.discount_amount = 0.0
+        self._running_total = 0.0
+        self._running_count = 0
 
     def apply_discount(self, code: str, amount: float) -> None:
         """Apply a discount to the basket."""
@@ -104,7 +125,7 @@ class SessionState:
                     "quantity": item.quantity,
                     "subtotal": item.subtotal
                 }
-                for item in self.basket
+                for item in self.basket.values()
             ],
             "item_count": self.basket_item_count,
             "subtotal": self.basket_total,
@@ -116,7 +137,9 @@ class SessionState:
 
     def reset(self) -> None:
         """Reset all session state."""
-        self.basket = []
+        self.basket = {}
+        self._running_total = 0.0
+        self._running_count = 0
         self.discount_code = None
         self.discount_amount = 0.0
         self.conversation_history = []
@@ -0,0 +1,84 @@
+"""
+Persistent tool result cache.
+
+Stores tool results in a small SQLite database (WAL mode) so that warm
+results survive process restarts. Every write is committed immediately,
+so interrupting the CLI does not lose recent entries.
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = Path("~/.cache/mcp_host")
+
+
+class ToolResultStore:
+    """Disk-backed key/value store for tool results with per-entry expiry."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_results "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+
+    @classmethod
+    def open_default(cls) -> "ToolResultStore | None":
+        """Open the cache in the user cache directory, or return None if unavailable."""
+        try:
+            return cls(DEFAULT_CACHE_DIR.expanduser() / "tool_results.sqlite3")
+        except (OSError, sqlite3.Error) as e:
+            print(f"Persistent tool cache disabled: {e}")
+            return None
+
+    @staticmethod
+    def make_key(call_key: str) -> str:
+        """Hash a canonical tool-call key into a fixed-size database key."""
+        return hashlib.sha1(call_key.encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        """
+        Get an unexpired result.
+
+        Returns:
+            (result, seconds until expiry), or None on a miss
+        """
+        now = time.time()
+        try:
+            row = self._conn.execute(
+                "SELECT value, expires FROM tool_results WHERE key = ? AND expires > ?",
+                (key, now),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return (row[0], row[1] - now) if row else None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Store a result that expires after ttl seconds."""
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_results (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Drop expired entries and close the database."""
+        try:
+            self._conn.execute("DELETE FROM tool_results WHERE expires <= ?", (time.time(),))
+        except sqlite3.Error:
+            pass
+        self._conn.close()
@@ -7,6 +7,7 @@ It initializes the MCP Host and connects to all configured MCP servers.
 """
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 
@@ -16,11 +17,63 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from mcp_host.core import MCPHost
 
 
+class AsyncStdin:
+    """
+    Line reader for stdin that waits on the event loop instead of blocking it.
+
+    Falls back to reading in a worker thread where the loop cannot watch stdin
+    (e.g. the Windows proactor loop).
+    """
+
+    def __init__(self):
+        self._fd = sys.stdin.fileno()
+        self._encoding = sys.stdin.encoding or "utf-8"
+        self._buffer = b""
+        self._eof = False
+
+    async def readline(self, prompt: str = "") -> str:
+        """
+        Print a prompt and read one line, without the trailing newline.
+
+        Raises:
+            EOFError: If stdin is closed and no input is left
+        """
+        print(prompt, end="", flush=True)
+        while b"\n" not in self._buffer and not self._eof:
+            try:
+                await self._wait_readable()
+            except NotImplementedError:
+                return await asyncio.to_thread(input)
+            chunk = os.read(self._fd, 4096)
+            self._eof = not chunk
+            self._buffer += chunk
+
+        line, newline, self._buffer = self._buffer.partition(b"\n")
+        if not line and not newline:
+            raise EOFError
+        return line.decode(self._encoding, errors="replace").rstrip("\r")
+
+    async def _wait_readable(self) -> None:
+        """Wait until stdin has data; returns at once for files the loop cannot poll."""
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        try:
+            loop.add_reader(self._fd, ready.set_result, None)
+        except PermissionError:
+            # Regular files are always readable and cannot be registered with epoll
+            return
+        try:
+            await ready
+        finally:
+            loop.remove_reader(self._fd)
+
+
 async def main():
     """Main entry point for the Voice Shopping Agent."""
     project_root = Path(__file__).parent.parent
 
     host = MCPHost(config_dir=Path(__file__).parent / "config")
+    stdin = AsyncStdin()
 
     try:
         # Connect to all enabled MCP servers
@@ -29,7 +82,7 @@ async def main():
         print("\n" + "=" * 50)
         print("  Voice Shopping Agent Ready!")
         print("=" * 50)
-        print(f"Connected servers: {list(host.sessions.keys())}")
+        print(f"Registered servers: {sorted(set(host.tool_to_server.values()))}")
         print(f"Available tools: {len(host.tools)}")
         print("=" * 50)
         print("\nHow can I help you find camping gear today?")
@@ -37,7 +90,7 @@ async def main():
 
         while True:
             try:
-                user_input = input("You: ").strip()
+                user_input = (await stdin.readline("You: ")).strip()
 
                 if not user_input:
                     continue
@@ -54,7 +107,8 @@ async def main():
                 response = await host.chat(user_input)
                 print(f"\nAssistant: {response}\n")
 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                # Ctrl-C arrives as a cancellation while awaiting input
                 print("\n\nGoodbye!")
                 break
             except EOFError:
@@ -64,5 +118,20 @@ async def main():
         await host.cleanup()
 
 
+def run() -> None:
+    """Run the agent, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    loop_factory = uvloop.new_event_loop if uvloop else None
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
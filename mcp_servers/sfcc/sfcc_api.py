@@ -1,43 +1,159 @@
 """SFCC (Salesforce Commerce Cloud) notification API client."""
 
-import requests
+import asyncio
+import json
+import logging
+import time
 from typing import Optional
 
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from sfcc_transport import close_client, get_client
+
+logger = logging.getLogger(__name__)
+
+# Customer the storefront session belongs to when a tool does not name one
+DEFAULT_USER_ID = "cust:00000001"
+
+# Result for the common 200 OK response; shared, so callers must not mutate it
+_OK_200 = {"success": True, "status_code": 200}
+
+
+def _encode(user_id: str, notification_type: str, payload: dict) -> bytes:
+    """Serialize a notification envelope with sorted keys, so equal notifications encode equally."""
+    envelope = {
+        "userId": user_id,
+        "type": notification_type,
+        "payload": payload,
+    }
+    if orjson is not None:
+        return orjson.dumps(envelope, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(envelope, sort_keys=True, separators=(",", ":")).encode()
+
 
 class SFCCAPI:
     """Client for SFCC SSE Hub notification API."""
 
+    __slots__ = (
+        "_url",
+        "_queue",
+        "_worker",
+        "_etag_cache",
+        "_recent",
+    )
+
     BASE_URL = "https://sfcc-sse-hub-agentforce-a10f0025fedb.herokuapp.com"
 
-    def __init__(self, default_user_id: str = "cust:00000001"):
-        self.default_user_id = default_user_id
-
-    def _notify(self, user_id: str, notification_type: str, payload: dict) -> dict:
-        """Send a notification to the SFCC SSE Hub."""
-        response = requests.post(
-            f"{self.BASE_URL}/notify",
-            json={
-                "userId": user_id,
-                "type": notification_type,
-                "payload": payload,
-            },
-            headers={"Content-Type": "application/json"},
-        )
-        response.raise_for_status()
-        return {"success": True, "status_code": response.status_code}
+    # Notifications that are safe to repeat. Re-sending the latest one of a type
+    # within REPEAT_TTL seconds is skipped; otherwise it is sent conditionally,
+    # so the hub may answer 304 Not Modified.
+    REPEATABLE_TYPES = frozenset({"SHOW_BANNER", "SET_SESSION"})
+    REPEAT_TTL = 5.0
+    ETAG_CACHE_MAXSIZE = 256
+
+    def __init__(self):
+        self._url = f"{self.BASE_URL}/notify"
+
+        # Advisory notifications (banners, session values) are sent in the
+        # background, in order, so tools can return without waiting on the hub
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Encoded notification body -> ETag returned by the hub
+        self._etag_cache: dict[bytes, str] = {}
+        # (user_id, type) -> (encoded body, time) of the latest queued notification
+        self._recent: dict[tuple[str, str], tuple[bytes, float]] = {}
+
+    async def close(self) -> None:
+        """Send any queued notifications, then close the HTTP client."""
+        if self._worker is not None:
+            await self._queue.join()
+            self._worker.cancel()
+            self._worker = None
+        await close_client()
+
+    async def _notify(self, user_id: str, notification_type: str, payload: dict) -> dict:
+        """Send a notification to the SFCC SSE Hub and wait for the response."""
+        body = _encode(user_id, notification_type, payload)
+        # Keep the hub's view in order: queued notifications go out first
+        if self._queue is not None:
+            await self._queue.join()
+        return await self._post(notification_type, body)
+
+    def _enqueue(self, user_id: str, notification_type: str, payload: dict) -> dict:
+        """Queue an advisory notification to be sent in the background."""
+        body = _encode(user_id, notification_type, payload)
+        if notification_type in self.REPEATABLE_TYPES:
+            now = time.monotonic()
+            latest = self._recent.get((user_id, notification_type))
+            if latest is not None and latest[0] == body and now - latest[1] < self.REPEAT_TTL:
+                return {"success": True, "cached": True}
+            self._recent[(user_id, notification_type)] = (body, now)
 
-    def show_banner(
-        self, text: str, url: str, user_id: Optional[str] = None
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._drain())
+        self._queue.put_nowait((notification_type, body))
+        return {"success": True, "queued": True}
+
+    async def _drain(self) -> None:
+        """Send queued notifications one at a time."""
+        while True:
+            notification_type, body = await self._queue.get()
+            try:
+                await self._post(notification_type, body)
+            except Exception as e:
+                logger.error(f"Error sending {notification_type} notification: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _post(self, notification_type: str, body: bytes) -> dict:
+        """POST one encoded notification envelope to the hub."""
+        # The canonical body doubles as the ETag cache key
+        etag_key = None
+        headers = None
+        if notification_type in self.REPEATABLE_TYPES:
+            etag_key = body
+            etag = self._etag_cache.get(etag_key)
+            if etag is not None:
+                headers = {"If-None-Match": etag}
+
+        response = await get_client().post(self._url, content=body, headers=headers)
+        status = response.status_code
+        if status == 304:
+            return {"success": True, "status_code": 304, "cached": True}
+        if status >= 300:
+            raise httpx.HTTPStatusError(
+                f"SFCC hub returned HTTP {status} for {notification_type}",
+                request=response.request,
+                response=response,
+            )
+        etag = response.headers.get("ETag")
+        if etag_key is not None and etag is not None:
+            self._etag_cache[etag_key] = etag
+            if len(self._etag_cache) > self.ETAG_CACHE_MAXSIZE:
+                del self._etag_cache[next(iter(self._etag_cache))]
+        if status == 200:
+            return _OK_200
+        return {"success": True, "status_code": status}
+
+    async def show_banner(
+        self, text: str, url: str, user_id: str = DEFAULT_USER_ID
     ) -> dict:
-        """Show a banner with text and navigate to URL."""
-        return self._notify(
-            user_id or self.default_user_id,
+        """Show a banner with text and navigate to URL (sent in the background)."""
+        return self._enqueue(
+            user_id,
             "SHOW_BANNER",
             {"text": text, "url": url},
         )
 
-    def show_plp(
-        self, text: str, category_path: str, user_id: Optional[str] = None
+    async def show_plp(
+        self, text: str, category_path: str, user_id: str = DEFAULT_USER_ID
     ) -> dict:
         """
         Show Product Listing Page (PLP).
@@ -45,12 +161,16 @@ class SFCCAPI:
         Args:
             text: Banner text to display
             category_path: Category URL path (e.g., '/s/nto/default/shoes-men-hiking')
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self.show_banner(text, category_path, user_id)
+        return self._enqueue(
+            user_id,
+            "SHOW_BANNER",
+            {"text": text, "url": category_path},
+        )
 
-    def show_pdp(
-        self, text: str, product_url: str, user_id: Optional[str] = None
+    async def show_pdp(
+        self, text: str, product_url: str, user_id: str = DEFAULT_USER_ID
     ) -> dict:
         """
         Show Product Detail Page (PDP).
@@ -58,12 +178,16 @@ class SFCCAPI:
         Args:
             text: Banner text to display
             product_url: Product URL path (e.g., 's/nto/default/product-name.html')
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self.show_banner(text, product_url, user_id)
+        return self._enqueue(
+            user_id,
+            "SHOW_BANNER",
+            {"text": text, "url": product_url},
+        )
 
-    def add_to_basket(
-        self, sku: str, quantity: int = 1, user_id: Optional[str] = None
+    async def add_to_basket(
+        self, sku: str, quantity: int = 1, user_id: str = DEFAULT_USER_ID
     ) -> dict:
         """
         Add item to shopping basket.
@@ -71,28 +195,28 @@ class SFCCAPI:
         Args:
             sku: Product SKU
             quantity: Quantity to add
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self._notify(
-            user_id or self.default_user_id,
+        return await self._notify(
+            user_id,
             "ADD_TO_BASKET",
             {"quantity": str(quantity), "sku": sku},
         )
 
-    def start_checkout(self, user_id: Optional[str] = None) -> dict:
+    async def start_checkout(self, user_id: str = DEFAULT_USER_ID) -> dict:
         """
         Navigate to checkout page.
 
         Args:
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self.show_banner(
-            "Checking out...",
-            "checkout?stage=payment#payment",
+        return self._enqueue(
             user_id,
+            "SHOW_BANNER",
+            {"text": "Checking out...", "url": "checkout?stage=payment#payment"},
         )
 
-    def submit_payment(
+    async def submit_payment(
         self,
         first_name: str,
         last_name: str,
@@ -110,7 +234,7 @@ class SFCCAPI:
         security_code: str,
         address2: str = "",
         save_card: bool = True,
-        user_id: Optional[str] = None,
+        user_id: str = DEFAULT_USER_ID,
     ) -> dict:
         """
         Submit payment and place order.
@@ -132,10 +256,10 @@ class SFCCAPI:
             security_code: CVV/security code
             address2: Secondary address line (optional)
             save_card: Whether to save card for future use
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self._notify(
-            user_id or self.default_user_id,
+        return await self._notify(
+            user_id,
             "SUBMIT_PAYMENT",
             {
                 "firstName": first_name,
@@ -157,31 +281,31 @@ class SFCCAPI:
             },
         )
 
-    def set_discount(
-        self, discount_percent: int, user_id: Optional[str] = None
+    async def set_discount(
+        self, discount_percent: int, user_id: str = DEFAULT_USER_ID
     ) -> dict:
         """
-        Set a negotiated discount for the session.
+        Set a negotiated discount for the session (sent in the background).
 
         Args:
             discount_percent: Discount percentage (e.g., 10 for 10%)
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self._notify(
-            user_id or self.default_user_id,
+        return self._enqueue(
+            user_id,
             "SET_SESSION",
             {"key": "negotiated", "value": str(discount_percent)},
         )
 
-    def show_order_history(self, user_id: Optional[str] = None) -> dict:
+    async def show_order_history(self, user_id: str = DEFAULT_USER_ID) -> dict:
         """
         Navigate to order history page.
 
         Args:
-            user_id: Customer ID (defaults to configured user)
+            user_id: Customer ID (defaults to DEFAULT_USER_ID)
         """
-        return self.show_banner(
-            "Here are your orders...",
-            "orders",
+        return self._enqueue(
             user_id,
+            "SHOW_BANNER",
+            {"text": "Here are your orders...", "url": "orders"},
         )
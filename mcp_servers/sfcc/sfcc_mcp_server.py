@@ -1,27 +1,53 @@
 #!/usr/bin/env python3
 """SFCC MCP Server - Exposes Salesforce Commerce Cloud tools via Model Context Protocol."""
 
-import json
 import logging
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
 from mcp.server.fastmcp import FastMCP
+from pydantic import BaseModel
 
-from sfcc_api import SFCCAPI
+from sfcc_api import DEFAULT_USER_ID, SFCCAPI
+
+# The shared tool helpers live one level up, in mcp_servers/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tool_utils import safe_tool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create FastMCP server
-mcp = FastMCP("sfcc-commerce")
+
+class BasketLine(BaseModel):
+    """One product to add in add_items_to_basket."""
+    sku: str
+    quantity: int = 1
+
 
 # Initialize SFCC API client
 sfcc_api = SFCCAPI()
 
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Flush queued notifications and close the SFCC HTTP client on shutdown."""
+    try:
+        yield
+    finally:
+        await sfcc_api.close()
+
+
+# Create FastMCP server
+mcp = FastMCP("sfcc-commerce", lifespan=lifespan)
+
+
 @mcp.tool()
-def show_product_listing(
-    text: str, category_path: str, user_id: str = "cust:00000001"
-) -> str:
+@safe_tool
+async def show_product_listing(
+    text: str, category_path: str, user_id: str = DEFAULT_USER_ID
+) -> dict:
     """
     Show a Product Listing Page (PLP) to the customer.
 
@@ -33,18 +59,15 @@ def show_product_listing(
     Returns:
         Confirmation of the navigation action
     """
-    try:
-        result = sfcc_api.show_plp(text, category_path, user_id)
-        return json.dumps({"action": "show_plp", "text": text, "url": category_path, **result})
-    except Exception as e:
-        logger.error(f"Error showing PLP: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.show_plp(text, category_path, user_id)
+    return {"action": "show_plp", "text": text, "url": category_path, **result}
 
 
 @mcp.tool()
-def show_product_detail(
-    text: str, product_url: str, user_id: str = "cust:00000001"
-) -> str:
+@safe_tool
+async def show_product_detail(
+    text: str, product_url: str, user_id: str = DEFAULT_USER_ID
+) -> dict:
     """
     Show a Product Detail Page (PDP) to the customer.
 
@@ -56,18 +79,15 @@ def show_product_detail(
     Returns:
         Confirmation of the navigation action
     """
-    try:
-        result = sfcc_api.show_pdp(text, product_url, user_id)
-        return json.dumps({"action": "show_pdp", "text": text, "url": product_url, **result})
-    except Exception as e:
-        logger.error(f"Error showing PDP: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.show_pdp(text, product_url, user_id)
+    return {"action": "show_pdp", "text": text, "url": product_url, **result}
 
 
 @mcp.tool()
-def add_to_basket(
-    sku: str, quantity: int = 1, user_id: str = "cust:00000001"
-) -> str:
+@safe_tool
+async def add_to_basket(
+    sku: str, quantity: int = 1, user_id: str = DEFAULT_USER_ID
+) -> dict:
     """
     Add a product to the customer's shopping basket.
 
@@ -79,16 +99,43 @@ def add_to_basket(
     Returns:
         Confirmation of the add to basket action
     """
-    try:
-        result = sfcc_api.add_to_basket(sku, quantity, user_id)
-        return json.dumps({"action": "add_to_basket", "sku": sku, "quantity": quantity, **result})
-    except Exception as e:
-        logger.error(f"Error adding to basket: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.add_to_basket(sku, quantity, user_id)
+    return {"action": "add_to_basket", "sku": sku, "quantity": quantity, **result}
 
 
 @mcp.tool()
-def start_checkout(user_id: str = "cust:00000001") -> str:
+@safe_tool
+async def add_items_to_basket(
+    items: list[BasketLine], stop_on_error: bool = False, user_id: str = DEFAULT_USER_ID
+) -> list[dict]:
+    """
+    Add several products to the customer's shopping basket in one call.
+
+    Args:
+        items: Products to add, each as {"sku": "...", "quantity": 1} (quantity defaults to 1)
+        stop_on_error: Stop at the first item that fails instead of continuing (defaults to False)
+        user_id: Customer ID (defaults to 'cust:00000001')
+
+    Returns:
+        One result per item, in order, like add_to_basket
+    """
+    results = []
+    for item in items:
+        sku, quantity = item.sku, item.quantity
+        try:
+            result = await sfcc_api.add_to_basket(sku, quantity, user_id)
+            results.append({"action": "add_to_basket", "sku": sku, "quantity": quantity, **result})
+        except Exception as e:
+            logger.error(f"Error adding {sku} to basket: {e}")
+            results.append({"sku": sku, "error": str(e)})
+            if stop_on_error:
+                break
+    return results
+
+
+@mcp.tool()
+@safe_tool
+async def start_checkout(user_id: str = DEFAULT_USER_ID) -> dict:
     """
     Navigate the customer to the checkout page.
 
@@ -98,16 +145,13 @@ def start_checkout(user_id: str = "cust:00000001") -> str:
     Returns:
         Confirmation of the checkout navigation
     """
-    try:
-        result = sfcc_api.start_checkout(user_id)
-        return json.dumps({"action": "start_checkout", **result})
-    except Exception as e:
-        logger.error(f"Error starting checkout: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.start_checkout(user_id)
+    return {"action": "start_checkout", **result}
 
 
 @mcp.tool()
-def place_order(
+@safe_tool
+async def place_order(
     first_name: str,
     last_name: str,
     address1: str,
@@ -124,8 +168,8 @@ def place_order(
     security_code: str,
     address2: str = "",
     save_card: bool = True,
-    user_id: str = "cust:00000001",
-) -> str:
+    user_id: str = DEFAULT_USER_ID,
+) -> dict:
     """
     Submit payment and place the order.
 
@@ -151,34 +195,31 @@ def place_order(
     Returns:
         Confirmation of the order placement
     """
-    try:
-        result = sfcc_api.submit_payment(
-            first_name=first_name,
-            last_name=last_name,
-            address1=address1,
-            address2=address2,
-            city=city,
-            postal_code=postal_code,
-            country=country,
-            state_code=state_code,
-            phone=phone,
-            card_type=card_type,
-            card_number=card_number,
-            card_owner=card_owner,
-            exp_month=exp_month,
-            exp_year=exp_year,
-            security_code=security_code,
-            save_card=save_card,
-            user_id=user_id,
-        )
-        return json.dumps({"action": "place_order", "customer": f"{first_name} {last_name}", **result})
-    except Exception as e:
-        logger.error(f"Error placing order: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.submit_payment(
+        first_name=first_name,
+        last_name=last_name,
+        address1=address1,
+        address2=address2,
+        city=city,
+        postal_code=postal_code,
+        country=country,
+        state_code=state_code,
+        phone=phone,
+        card_type=card_type,
+        card_number=card_number,
+        card_owner=card_owner,
+        exp_month=exp_month,
+        exp_year=exp_year,
+        security_code=security_code,
+        save_card=save_card,
+        user_id=user_id,
+    )
+    return {"action": "place_order", "customer": f"{first_name} {last_name}", **result}
 
 
 @mcp.tool()
-def offer_discount(discount_percent: int, user_id: str = "cust:00000001") -> str:
+@safe_tool
+async def offer_discount(discount_percent: int, user_id: str = DEFAULT_USER_ID) -> dict:
     """
     Offer a negotiated discount to the customer for their session.
 
@@ -189,16 +230,13 @@ def offer_discount(discount_percent: int, user_id: str = "cust:00000001") -> str
     Returns:
         Confirmation of the discount application
     """
-    try:
-        result = sfcc_api.set_discount(discount_percent, user_id)
-        return json.dumps({"action": "offer_discount", "discount": f"{discount_percent}%", **result})
-    except Exception as e:
-        logger.error(f"Error offering discount: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.set_discount(discount_percent, user_id)
+    return {"action": "offer_discount", "discount": f"{discount_percent}%", **result}
 
 
 @mcp.tool()
-def show_order_history(user_id: str = "cust:00000001") -> str:
+@safe_tool
+async def show_order_history(user_id: str = DEFAULT_USER_ID) -> dict:
     """
     Navigate the customer to their order history page.
 
@@ -208,12 +246,8 @@ def show_order_history(user_id: str = "cust:00000001") -> str:
     Returns:
         Confirmation of the navigation to order history
     """
-    try:
-        result = sfcc_api.show_order_history(user_id)
-        return json.dumps({"action": "show_order_history", **result})
-    except Exception as e:
-        logger.error(f"Error showing order history: {e}")
-        return json.dumps({"error": str(e)})
+    result = await sfcc_api.show_order_history(user_id)
+    return {"action": "show_order_history", **result}
 
 
 if __name__ == "__main__":
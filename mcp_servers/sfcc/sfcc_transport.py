@@ -0,0 +1,40 @@
+"""Shared HTTP transport for SFCC clients."""
+
+import functools
+import socket
+
+import httpx
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Heroku drops idle connections after 55s; TCP keepalive probes keep the pooled
+# connection alive (or detect it is gone) between bursts of tool calls
+_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+]
+
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP/2 client.
+
+    Every SFCC client in the process shares this connection pool, so they all
+    reuse one warm TLS connection to the hub. Must be first called from inside
+    the event loop that will use it.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+        socket_options=_KEEPALIVE_OPTIONS,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=10.0, headers=JSON_HEADERS)
+
+
+async def close_client() -> None:
+    """Close the shared client, if it was created; the next get_client() makes a new one."""
+    if get_client.cache_info().currsize:
+        await get_client().aclose()
+        get_client.cache_clear()
@@ -0,0 +1,49 @@
+"""Helpers shared by the MCP servers for exposing tools."""
+
+import functools
+import inspect
+import json
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(obj) -> str:
+    """Serialize a tool result as compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def safe_tool(fn):
+    """
+    Wrap a sync or async tool that returns a JSON-serializable result.
+
+    The result is serialized once here, and any exception is logged and
+    returned as {"error": ...} so the MCP call itself never fails.
+    """
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs) -> str:
+            try:
+                return _dumps(await fn(*args, **kwargs))
+            except Exception as e:
+                logger.error(f"Error in {fn.__name__}: {e}")
+                return _dumps({"error": str(e)})
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs) -> str:
+            try:
+                return _dumps(fn(*args, **kwargs))
+            except Exception as e:
+                logger.error(f"Error in {fn.__name__}: {e}")
+                return _dumps({"error": str(e)})
+
+    # FastMCP reads the signature of the wrapped function; the tool still returns str
+    wrapper.__signature__ = inspect.signature(fn).replace(return_annotation=str)
+    return wrapper
@@ -43,7 +43,7 @@ Include relevant details like temperature, conditions, and any weather advisorie
         else:
             result = {"error": f"Unknown tool: {tool_name}"}
 
-        return json.dumps(result, indent=2)
+        return json.dumps(result, separators=(",", ":"))
 
     def chat(self, user_message: str) -> str:
         """
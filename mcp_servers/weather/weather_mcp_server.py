@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """Weather Agent MCP Server - Exposes weather tools via Model Context Protocol."""
 
-import json
 import logging
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
 from weather_tools import WeatherAPI
 
+# The shared tool helpers live one level up, in mcp_servers/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tool_utils import safe_tool
+
 # Load environment variables
 load_dotenv()
 
@@ -15,6 +21,7 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 # Create FastMCP server
 mcp = FastMCP("weather-agent")
 
@@ -23,7 +30,8 @@ weather_api = WeatherAPI()
 
 
 @mcp.tool()
-def get_current_weather(location: str, units: str = "metric") -> str:
+@safe_tool
+def get_current_weather(location: str, units: str = "metric") -> dict:
     """
     Get current weather conditions for a location.
 
@@ -34,16 +42,12 @@ def get_current_weather(location: str, units: str = "metric") -> str:
     Returns:
         Current weather data including temperature, humidity, wind speed, and conditions
     """
-    try:
-        result = weather_api.get_current_weather(location, units)
-        return json.dumps(result, indent=2)
-    except Exception as e:
-        logger.error(f"Error getting current weather: {e}")
-        return json.dumps({"error": str(e)})
+    return weather_api.get_current_weather(location, units)
 
 
 @mcp.tool()
-def get_forecast(location: str, days: int = 5, units: str = "metric") -> str:
+@safe_tool
+def get_forecast(location: str, days: int = 5, units: str = "metric") -> dict:
     """
     Get weather forecast for the next few days.
 
@@ -55,13 +59,8 @@ def get_forecast(location: str, days: int = 5, units: str = "metric") -> str:
     Returns:
         Weather forecast with daily high/low temperatures and conditions
     """
-    try:
-        days = max(1, min(5, days))  # Clamp to 1-5
-        result = weather_api.get_forecast(location, days, units)
-        return json.dumps(result, indent=2)
-    except Exception as e:
-        logger.error(f"Error getting forecast: {e}")
-        return json.dumps({"error": str(e)})
+    days = max(1, min(5, days))  # Clamp to 1-5
+    return weather_api.get_forecast(location, days, units)
 
 
 if __name__ == "__main__":
@@ -1,39 +1,36 @@
 """Shared data models used across MCP servers."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Product model."""
     id: str
     name: str
     description: str
     category: str
-    price: float
+    price_cents: int
     image_url: Optional[str] = None
-    attributes: list[str] = None
+    attributes: list[str] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.attributes is None:
-            self.attributes = []
+    @property
+    def price(self) -> float:
+        """Price in major currency units."""
+        return self.price_cents / 100
 
 
-@dataclass
+@dataclass(slots=True)
 class Address:
-    """Delivery address model."""
+    """
+    Delivery address model.
+
+    Serialize with orjson.dumps(address), which handles dataclasses natively,
+    or dataclasses.asdict(address) when a dict is needed.
+    """
     name: str
     street: str
     city: str
     postcode: str
     country: str = "UK"
-
-    def to_dict(self) -> dict:
-        return {
-            "name": self.name,
-            "street": self.street,
-            "city": self.city,
-            "postcode": self.postcode,
-            "country": self.country
-        }